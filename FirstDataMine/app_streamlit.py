@@ -1,6 +1,8 @@
 # app_streamlit.py
 #!/usr/bin/env python3
 
+from concurrent.futures import ThreadPoolExecutor
+
 import altair as alt
 import pandas as pd
 import streamlit as st
@@ -8,10 +10,31 @@ import streamlit as st
 from config import DEFAULT_LOCATIONS, LOCAL_TZ
 from weather_core import (
     fetch_hourly_json, hourly_to_frame, to_local_naive,
-    daily_summary, rolling_anomaly, save_cache, load_cache, arrow_safe_df
+    daily_summary, rolling_anomaly, save_cache, load_cache, arrow_safe_df, frame_digest
 )
 
 st.set_page_config(page_title="Grand Junction Weather Data", layout="wide")
+
+
+# Cached wrappers: core stays Streamlit-free, reruns within the TTL skip the network
+def _frame_key(d: pd.DataFrame):
+    return (tuple(d.columns), pd.util.hash_pandas_object(d, index=True).to_numpy().tobytes())
+
+
+_frame_hash = {pd.DataFrame: _frame_key}
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_hourly(lat: float, lon: float, days: int):
+    js = fetch_hourly_json(lat, lon, days)
+    return js, hourly_to_frame(js)
+
+
+cached_local_naive = st.cache_data(show_spinner=False, hash_funcs=_frame_hash)(to_local_naive)
+cached_daily_summary = st.cache_data(show_spinner=False, hash_funcs=_frame_hash)(daily_summary)
+cached_rolling_anomaly = st.cache_data(show_spinner=False)(rolling_anomaly)
+cached_arrow_safe_df = st.cache_data(show_spinner=False, hash_funcs=_frame_hash)(arrow_safe_df)
+
 st.title("Real Time Weather - Grand Junction")
 
 # Sidebar
@@ -21,32 +44,57 @@ days = st.sidebar.slider("Window (days)", 1, 14, 7)
 show_debug = st.sidebar.checkbox("Show raw query URL", value=False)
 temp_unit_label = "°F"  # keep in sync with weather_core.open_meteo_url()
 
+# First run: warm the fetch cache for every location in parallel (network I/O releases the GIL)
+if not st.session_state.get("_prefetched"):
+    pool = ThreadPoolExecutor(max_workers=len(DEFAULT_LOCATIONS))
+    st.session_state["_prefetch"] = {
+        (label, days): pool.submit(load_hourly, p_lat, p_lon, days)
+        for label, (p_lat, p_lon) in DEFAULT_LOCATIONS.items()
+    }
+    pool.shutdown(wait=False)
+    st.session_state["_prefetched"] = True
+
 # Fetch + cache (logic is in core)
+js = None
 try:
-    js = fetch_hourly_json(lat, lon, days)
-    df_utc = hourly_to_frame(js)
-    save_cache(df_utc, lat, lon)
+    pending = st.session_state["_prefetch"].pop((loc_label, days), None)
+    if pending is not None:
+        # Only wait for the in-flight fetch; a failed prefetch is retried by load_hourly below
+        try:
+            pending.result()
+        except Exception:
+            pass
+    js, df_utc = load_hourly(lat, lon, days)
+    # Only touch the disk when the data actually changed since the last write
+    digest = frame_digest(df_utc)
+    hash_key = f"cache_hash_{lat}_{lon}"
+    if st.session_state.get(hash_key) != digest:
+        save_cache(df_utc, lat, lon)
+        st.session_state[hash_key] = digest
 except Exception as e:
     st.error(f"Fetch error: {e}")
     df_utc = load_cache(lat, lon)
-    if df_utc.empty():
+    if df_utc.empty:
         st.stop()
 
 if show_debug and isinstance(js, dict) and "_query_url" in js:
     st.caption(f"Query: {js['_query_url']}")
 
-df_local = to_local_naive(df_utc)
+df_local = cached_local_naive(df_utc)
+
+# One long-form frame for the charts, only the plotted columns (Vega-Lite serializes it all)
+plot_cols = [c for c in ("temperature_2m", "wind_speed_10m") if c in df_local.columns]
+plot_df = cached_arrow_safe_df(df_local[plot_cols].reset_index().rename(columns={"time": "t"}))
 
 left, right = st.columns(2)
 
 with left:
     st.subheader("Recent hourly samples")
-    st.dataframe(arrow_safe_df(df_local.tail(24)), use_container_width=True)
+    st.dataframe(cached_arrow_safe_df(df_local.tail(24)), use_container_width=True)
 
     if "temperature_2m" in df_local.columns:
-        temp_df = arrow_safe_df(df_local.reset_index().rename(columns={"time": "t"}))
         chart_temp = (
-            alt.Chart(temp_df)
+            alt.Chart(plot_df[["t", "temperature_2m"]])
             .mark_line()
             .encode(x="t:T", y=alt.Y("temperature_2m:Q", title=f"Temperature ({temp_unit_label})"))
             .properties(height=220)
@@ -54,9 +102,8 @@ with left:
         st.altair_chart(chart_temp, use_container_width=True)
 
     if "wind_speed_10m" in df_local.columns:
-        wind_df = arrow_safe_df(df_local.reset_index().rename(columns={"time": "t"}))
         chart_wind = (
-            alt.Chart(wind_df)
+            alt.Chart(plot_df[["t", "wind_speed_10m"]])
             .mark_line()
             .encode(x="t:T", y=alt.Y("wind_speed_10m:Q", title="Wind Speed (m/s)"))
             .properties(height=220)
@@ -66,17 +113,17 @@ with left:
 with right:
     st.subheader("Daily summaries & simple anomaly")
 
-    daily = daily_summary(df_local)
+    daily = cached_daily_summary(df_local)
     if daily.empty:
         st.info("No daily data yet.")
     else:
         st.markdown("**Daily summary (last few days)**")
-        st.dataframe(arrow_safe_df(daily.tail(7)), use_container_width=True)
+        st.dataframe(cached_arrow_safe_df(daily.tail(7)), use_container_width=True)
 
         if "temperature_2m" in df_local.columns:
             df_anom = df_local[["temperature_2m"]].copy()
-            df_anom["temp_z24"] = rolling_anomaly(df_anom["temperature_2m"], window=24)
-            zdf = arrow_safe_df(df_anom.reset_index().rename(columns={"time": "t"}))
+            df_anom["temp_z24"] = cached_rolling_anomaly(df_anom["temperature_2m"], window=24)
+            zdf = cached_arrow_safe_df(df_anom[["temp_z24"]].reset_index().rename(columns={"time": "t"}))
             chart_z = (
                 alt.Chart(zdf)
                 .mark_line()
@@ -2,6 +2,10 @@
 import os
 DATA_DIR = "data"
 LOCAL_TZ = "America/Denver"
+# "parquet" (compressed, default) or "arrow" (memory-mapped Arrow IPC, fastest reload)
+CACHE_FORMAT = os.environ.get("WEATHER_CACHE", "parquet")
+# Stream-parse the API response with ijson (needs ijson); only pays off on large windows
+STREAM_PARSE = os.environ.get("WEATHER_STREAM_PARSE", "0") == "1"
 DEFAULT_LOCATIONS = {
     "Grand Junction, CO": (39.0639, -108.5506),
     "Fruita, CO": (39.1589, -108.7280),
@@ -2,9 +2,44 @@
 import os
 from urllib.parse import urlencode
 from datetime import timezone
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
-from config import DATA_DIR, LOCAL_TZ
+import pyarrow as pa
+import pyarrow.parquet as pq
+from config import DATA_DIR, LOCAL_TZ, CACHE_FORMAT, STREAM_PARSE
+
+try:
+    # C parser; noticeably faster on the long numeric hourly arrays
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    # Running-sum moving window; falls back to pandas rolling if missing
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+try:
+    from xxhash import xxh64_intdigest as _digest
+except ImportError:
+    import hashlib
+
+    def _digest(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:
+    njit = None
 
 """
 Name: Christian Tuttle
@@ -18,33 +53,77 @@ Im guessing that is ok based off the assignment description
 
 """
 
+# One shared session so repeat fetches reuse the TLS connection to open-meteo
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+))
+_SESSION.headers.update({"User-Agent": "weather-mine/1.0"})
+
+# Everything but lat/lon/past_hours is fixed, so encode it once at import
+_BASE_URL = "https://api.open-meteo.com/v1/forecast"
+_STATIC_QS = urlencode({
+    "hourly": ",".join([
+        "temperature_2m",
+        "relative_humidity_2m",
+        "precipitation",
+        "wind_speed_10m",
+        "wind_gusts_10m",
+    ]),
+    "timezone": "UTC",
+    "forecast_hours": 0,
+    "wind_speed_unit": "ms",
+    "precipitation_unit": "mm",
+    # NOTE: choose 'celsius' or 'fahrenheit' here; document in UI labels.
+    "temperature_unit": "fahrenheit",
+})
+
 def open_meteo_url(lat: float, lon: float, past_hours: int) -> str:
-    base = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": ",".join([
-            "temperature_2m",
-            "relative_humidity_2m",
-            "precipitation",
-            "wind_speed_10m",
-            "wind_gusts_10m",
-        ]),
-        "timezone": "UTC",
-        "past_hours": past_hours,
-        "forecast_hours": 0,
-        "wind_speed_unit": "ms",
-        "precipitation_unit": "mm",
-        # NOTE: choose 'celsius' or 'fahrenheit' here; document in UI labels.
-        "temperature_unit": "fahrenheit",
-    }
-    return f"{base}?{urlencode(params)}"
+    return f"{_BASE_URL}?latitude={lat}&longitude={lon}&past_hours={past_hours}&{_STATIC_QS}"
+
+def _stream_hourly(r: requests.Response, n_expected: int) -> dict:
+    # Fill preallocated arrays from parser events while the body is still arriving.
+    # Everything outside "hourly" (units, latitude, elevation, ...) is rebuilt as-is,
+    # so the result has the same shape as the buffered json_loads path.
+    r.raw.decode_content = True
+    meta = ijson.ObjectBuilder()
+    arrays, filled = {}, {}
+    for prefix, event, value in ijson.parse(r.raw, use_float=True):
+        if prefix != "hourly" and not prefix.startswith("hourly."):
+            meta.event(event, value)
+            continue
+        if not prefix.endswith(".item"):
+            continue
+        name = prefix[len("hourly."):-len(".item")]
+        arr = arrays.get(name)
+        if arr is None:
+            dtype = "datetime64[s]" if name == "time" else np.float32
+            arr = arrays[name] = np.empty(n_expected, dtype=dtype)
+            filled[name] = 0
+        i = filled[name]
+        if i == arr.shape[0]:
+            arr = arrays[name] = np.resize(arr, 2 * i)
+        if event == "null":
+            arr[i] = np.datetime64("NaT") if name == "time" else np.nan
+        else:
+            arr[i] = value
+        filled[name] = i + 1
+    js = meta.value
+    js["hourly"] = {k: v[:filled[k]] for k, v in arrays.items()}
+    return js
 
 def fetch_hourly_json(lat: float, lon: float, days: int) -> dict:
     url = open_meteo_url(lat, lon, past_hours=days * 24)
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
-    js = r.json()
+    if STREAM_PARSE and ijson is not None:
+        with _SESSION.get(url, timeout=30, stream=True) as r:
+            r.raise_for_status()
+            js = _stream_hourly(r, n_expected=days * 24 + 1)
+    else:
+        r = _SESSION.get(url, timeout=30)
+        r.raise_for_status()
+        js = json_loads(r.content)
     js["_query_url"] = url
     return js
 
@@ -52,66 +131,190 @@ def hourly_to_frame(js: dict) -> pd.DataFrame:
     hourly = js.get("hourly", {})
     if not hourly:
         return pd.DataFrame()
-    df = pd.DataFrame(hourly)
-    if "time" in df.columns:
-        df["time"] = pd.to_datetime(df["time"], utc=True, errors="coerce")
-        df = df.set_index("time").sort_index()
-    for c in df.columns:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df
+    # Build typed arrays directly (JSON nulls become NaN) instead of object columns + to_numeric
+    cols = {k: np.asarray(v, dtype=np.float32) for k, v in hourly.items() if k != "time"}
+    if "time" not in hourly:
+        return pd.DataFrame(cols)
+    times = np.asarray(hourly["time"], dtype="datetime64[s]")
+    df = pd.DataFrame(cols, index=pd.DatetimeIndex(times, tz="UTC", name="time"))
+    return df.sort_index()
 
 def to_local_naive(df_utc_idx: pd.DataFrame) -> pd.DataFrame:
     if df_utc_idx.empty:
         return df_utc_idx
-    out = df_utc_idx.copy()
-    out.index = out.index.tz_convert(LOCAL_TZ).tz_localize(None)
+    # Only the index changes; share the column blocks instead of copying the frame
+    new_idx = df_utc_idx.index.tz_convert(LOCAL_TZ).tz_localize(None)
+    out = df_utc_idx.copy(deep=False)
+    out.index = new_idx
+    # Naive index + numeric columns: tells arrow_safe_df there is nothing to convert.
+    # Records the verified columns so frames that gain columns later are re-checked.
+    if all(pd.api.types.is_numeric_dtype(t) for t in out.dtypes):
+        out.attrs = {**out.attrs, "_arrow_safe": tuple(out.columns)}
     return out
 
 def daily_summary(df_local_naive: pd.DataFrame) -> pd.DataFrame:
     if df_local_naive.empty:
         return pd.DataFrame()
-    daily = df_local_naive.resample("D").agg({
-        "temperature_2m": ["mean", "min", "max"],
-        "precipitation": "sum",
-        "wind_speed_10m": "mean",
+    # datetime64[D] keys: one groupby pass, no resampler bins or MultiIndex to flatten
+    day = df_local_naive.index.values.astype("datetime64[D]")
+    gb = df_local_naive.groupby(day, sort=True)
+    daily = pd.DataFrame({
+        "temperature_2m_mean": gb["temperature_2m"].mean(),
+        "temperature_2m_min": gb["temperature_2m"].min(),
+        "temperature_2m_max": gb["temperature_2m"].max(),
+        "precipitation_sum": gb["precipitation"].sum(),
+        "wind_speed_10m_mean": gb["wind_speed_10m"].mean(),
     })
-    daily.columns = ["_".join(col).strip("_") for col in daily.columns.to_flat_index()]
+    # Keep empty calendar days as NaN rows, like resample("D") did
+    all_days = pd.DatetimeIndex(np.arange(day.min(), day.max() + 1), name="time")
+    daily = daily.reindex(all_days)
+    daily["precipitation_sum"] = daily["precipitation_sum"].fillna(0.0)  # resample sum of an empty day is 0
     return daily
 
+def _zscore_span(x: np.ndarray, w: int, minp: int, z: np.ndarray, lo: int, hi: int) -> None:
+    # One pass: running sum / sum of squares / count over a fixed window -> mu, sd, z.
+    # Fills z[lo:hi]; the window is warmed up from lo - w + 1 without writing.
+    start = max(0, lo - w + 1)
+    run_sum = 0.0
+    run_sumsq = 0.0
+    run_n = 0
+    for i in range(start, hi):
+        v = x[i]
+        if not np.isnan(v):
+            run_sum += v
+            run_sumsq += v * v
+            run_n += 1
+        if i - w >= start:
+            old = x[i - w]
+            if not np.isnan(old):
+                run_sum -= old
+                run_sumsq -= old * old
+                run_n -= 1
+        if i < lo:
+            continue
+        z[i] = np.nan
+        if run_n >= minp and run_n > 1 and not np.isnan(v):
+            mu = run_sum / run_n
+            var = (run_sumsq - run_sum * run_sum / run_n) / (run_n - 1)
+            if var > 0.0:
+                z[i] = (v - mu) / np.sqrt(var)
+
+def _rolling_zscore(x: np.ndarray, w: int, minp: int) -> np.ndarray:
+    z = np.empty(x.shape[0])
+    _zscore_span(x, w, minp, z, 0, x.shape[0])
+    return z
+
+def _rolling_zscore_parallel(x: np.ndarray, w: int, minp: int, n_chunks: int) -> np.ndarray:
+    # Independent chunks, each re-warming its own window, so threads share no state
+    n = x.shape[0]
+    z = np.empty(n)
+    step = (n + n_chunks - 1) // n_chunks
+    for k in prange(n_chunks):
+        lo = k * step
+        hi = min(n, lo + step)
+        if lo < hi:
+            _zscore_span(x, w, minp, z, lo, hi)
+    return z
+
+# Thread start-up outweighs the work on short series (a 14-day window is 336 points)
+_PARALLEL_MIN_LEN = 10_000
+
+if njit is not None:
+    # cache=True writes the compiled kernel to __pycache__ (or NUMBA_CACHE_DIR / ~/.cache/numba),
+    # so restarts skip JIT. No "nnan" fast-math flag: the kernel relies on isnan.
+    _fast = {"reassoc", "contract", "arcp"}
+
+    def _jit(fn, **opts):
+        try:
+            return njit(cache=True, fastmath=_fast, boundscheck=False, **opts)(fn)
+        except RuntimeError:
+            # No writable cache location (read-only deploy): compile in memory instead
+            return njit(cache=False, fastmath=_fast, boundscheck=False, **opts)(fn)
+
+    _zscore_span = _jit(_zscore_span)
+    _rolling_zscore = _jit(_rolling_zscore)
+    _rolling_zscore_parallel = _jit(_rolling_zscore_parallel, parallel=True)
+
 def rolling_anomaly(s: pd.Series, window: int = 24) -> pd.Series:
     if s is None or s.empty:
         return s
-    mu = s.rolling(window, min_periods=max(4, window//4)).mean()
-    sd = s.rolling(window, min_periods=max(4, window//4)).std()
+    minp = max(4, window//4)
+    if njit is not None:
+        x = s.to_numpy(dtype=np.float64)
+        if len(x) > _PARALLEL_MIN_LEN:
+            z = _rolling_zscore_parallel(x, window, minp, get_num_threads())
+        else:
+            z = _rolling_zscore(x, window, minp)
+        return pd.Series(z, index=s.index, name=s.name)
+    if bn is not None:
+        x = s.to_numpy(dtype=np.float64)
+        mu = bn.move_mean(x, window=window, min_count=minp)
+        sd = bn.move_std(x, window=window, min_count=minp, ddof=1)
+        return pd.Series((x - mu) / sd, index=s.index, name=s.name)
+    mu = s.rolling(window, min_periods=minp).mean()
+    sd = s.rolling(window, min_periods=minp).std()
     return (s - mu) / sd
 
 def cache_path(lat: float, lon: float) -> str:
-    return os.path.join(DATA_DIR, f"weather_{lat:.4f}_{lon:.4f}.csv")
+    ext = "arrow" if CACHE_FORMAT == "arrow" else "parquet"
+    return os.path.join(DATA_DIR, f"weather_{lat:.4f}_{lon:.4f}.{ext}")
+
+def frame_digest(df_utc: pd.DataFrame) -> int:
+    # Cheap fingerprint of index + values, used to skip rewriting an unchanged cache
+    return _digest(df_utc.index.values.tobytes() + df_utc.to_numpy().tobytes())
 
 def save_cache(df_utc: pd.DataFrame, lat: float, lon: float) -> None:
-    df_utc.to_csv(cache_path(lat, lon))
+    table = pa.Table.from_pandas(df_utc, preserve_index=True)
+    path = cache_path(lat, lon)
+    if CACHE_FORMAT == "arrow":
+        # Write then rename: a reader still memory-mapping the old file keeps a valid inode
+        tmp = path + ".tmp"
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+        return
+    # float32 columns are high-entropy readings; dictionary pages only add overhead
+    pq.write_table(
+        table, path,
+        version="2.6", compression="zstd",
+        use_dictionary=False, data_page_size=64 * 1024,
+    )
 
 def load_cache(lat: float, lon: float) -> pd.DataFrame:
     path = cache_path(lat, lon)
     if not os.path.exists(path):
         return pd.DataFrame()
-    df = pd.read_csv(path, parse_dates=["time"], index_col="time")
-    if df.index.tz is None:
-        df.index = df.index.tz_localize("UTC")
-    return df
+    if CACHE_FORMAT == "arrow":
+        # Pages in only what is touched; numeric columns hand over to pandas without a copy
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        return reader.read_all().to_pandas(split_blocks=True, self_destruct=True)
+    # Parquet keeps dtypes and the UTC index tz, so no re-parsing or tz_localize
+    return pd.read_parquet(path, engine="pyarrow")
 
 def arrow_safe_df(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
+    safe_cols = df.attrs.get("_arrow_safe")
+    if (
+        safe_cols is not None
+        and set(df.columns) <= set(safe_cols)
+        and all(pd.api.types.is_numeric_dtype(t) for t in df.dtypes)
+    ):
+        return df.reset_index()
     frame = df.reset_index().copy()
     for c in frame.columns:
-        if pd.api.types.is_object_dtype(frame[c]) or pd.api.types.is_string_dtype(frame[c]):
-            try:
-                coerced = pd.to_datetime(frame[c], errors="coerce")
-                if coerced.notna().sum() >= max(1, int(0.8 * len(coerced))):
-                    frame[c] = coerced
-            except Exception:
-                pass
+        if not pd.api.types.is_datetime64_any_dtype(frame[c]) and (
+            pd.api.types.is_object_dtype(frame[c]) or pd.api.types.is_string_dtype(frame[c])
+        ):
+            # Cheap sniff on a few values; only ISO-looking columns pay for the full parse
+            sample = frame[c].dropna().head(5).astype(str)
+            if not sample.empty and sample.str.match(r"^\d{4}-\d{2}-\d{2}").all():
+                try:
+                    coerced = pd.to_datetime(frame[c], errors="coerce", format="ISO8601")
+                    if coerced.notna().sum() >= max(1, int(0.8 * len(coerced))):
+                        frame[c] = coerced
+                except Exception:
+                    pass
         if pd.api.types.is_datetime64_any_dtype(frame[c]):
             try:
                 if getattr(frame[c].dt, "tz", None) is not None:
@@ -2,8 +2,9 @@
 """
 Weather Data Mine (Open-Meteo, no API key)
 
-- Single-file Streamlit app for near real-time weather around Grand Junction, CO.
-- Fetches hourly data from Open-Meteo, writes CSV cache to data/ (git-ignored).
+- Streamlit app for near real-time weather around Grand Junction, CO.
+- Fetches hourly data from Open-Meteo via FirstDataMine/weather_core.py,
+  writes a Parquet cache to data/ (git-ignored).
 - Shows recent samples, charts, daily summaries, and a rolling z-score anomaly.
 
 Assignment-friendly:
@@ -11,145 +12,22 @@ Assignment-friendly:
 - Raw data saved locally under data/ and excluded via .gitignore.
 
 Run:
-  streamlit run app_streamlit.py
+  streamlit run fetch.py
 """
 
 import os
-import json
-from datetime import datetime, timedelta, timezone
+import sys
 
-import requests
-import pandas as pd
 import streamlit as st
 import altair as alt
 
-# ---------------------------- Config ----------------------------
-# Default: Grand Junction, CO (approx)
-DEFAULT_LOCATIONS = {
-    "Grand Junction, CO": (39.0639, -108.5506),
-    "Fruita, CO": (39.1589, -108.7280),
-    "Palisade, CO": (39.1108, -108.3509),
-    "Montrose, CO": (38.4783, -107.8762),
-}
-
-LOCAL_TZ = "America/Denver"
-DATA_DIR = "data"
-os.makedirs(DATA_DIR, exist_ok=True)
-
-# ---------------------------- Helpers ----------------------------
-def open_meteo_url(lat: float, lon: float, past_hours: int) -> str:
-    from urllib.parse import urlencode
-    base = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": ",".join([
-            "temperature_2m",
-            "relative_humidity_2m",
-            "precipitation",
-            "wind_speed_10m",
-            "wind_gusts_10m",
-        ]),
-        "timezone": "UTC",
-        "past_hours": past_hours,     # go back N hours from *now*
-        "forecast_hours": 0,          # only past window
-        "wind_speed_unit": "ms",      # so our chart label (m/s) is correct
-        "precipitation_unit": "mm",   # default, but explicit
-        "temperature_unit": "fahrenheit"
-    }
-    return f"{base}?{urlencode(params)}"
-
-
-def fetch_hourly_json(lat: float, lon: float, days: int) -> dict:
-    url = open_meteo_url(lat, lon, past_hours=days * 24)
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
-    js = r.json()
-    js["_query_url"] = url
-    return js
-
-
-def hourly_to_frame(js: dict) -> pd.DataFrame:
-    hourly = js.get("hourly", {})
-    if not hourly:
-        return pd.DataFrame()
-    df = pd.DataFrame(hourly)
-    # 'time' comes as ISO strings in UTC
-    if "time" in df.columns:
-        df["time"] = pd.to_datetime(df["time"], utc=True, errors="coerce")
-        df = df.set_index("time").sort_index()
-    # Make sure numeric cols are numeric
-    for c in df.columns:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df
-
-def to_local_naive(df_utc_idx: pd.DataFrame) -> pd.DataFrame:
-    """UTC DatetimeIndex → convert to local tz then drop tz for Streamlit/Arrow friendliness."""
-    if df_utc_idx.empty:
-        return df_utc_idx
-    out = df_utc_idx.copy()
-    out.index = out.index.tz_convert(LOCAL_TZ).tz_localize(None)
-    return out
-
-def daily_summary(df_local_naive: pd.DataFrame) -> pd.DataFrame:
-    """Simple daily stats from hourly: mean/min/max temp, precip sum, wind mean."""
-    if df_local_naive.empty:
-        return pd.DataFrame()
-    daily = df_local_naive.resample("D").agg({
-        "temperature_2m": ["mean", "min", "max"],
-        "precipitation": "sum",
-        "wind_speed_10m": "mean",
-    })
-    daily.columns = ["_".join(col).strip("_") for col in daily.columns.to_flat_index()]
-    return daily
-
-def rolling_anomaly(s: pd.Series, window: int = 24) -> pd.Series:
-    """Z-score vs rolling mean/std (e.g., 24 hours)."""
-    if s is None or s.empty:
-        return s
-    mu = s.rolling(window, min_periods=max(4, window//4)).mean()
-    sd = s.rolling(window, min_periods=max(4, window//4)).std()
-    return (s - mu) / sd
-
-def cache_path(lat: float, lon: float) -> str:
-    return os.path.join(DATA_DIR, f"weather_{lat:.4f}_{lon:.4f}.csv")
-
-def save_cache(df_utc: pd.DataFrame, lat: float, lon: float) -> None:
-    # Write UTC index to CSV; keep it UTC in cache
-    path = cache_path(lat, lon)
-    df_utc.to_csv(path)
-
-def load_cache(lat: float, lon: float) -> pd.DataFrame:
-    path = cache_path(lat, lon)
-    if not os.path.exists(path):
-        return pd.DataFrame()
-    df = pd.read_csv(path, parse_dates=["time"], index_col="time")
-    # Ensure index is UTC tz-aware for consistent conversions later
-    if df.index.tz is None:
-        df.index = df.index.tz_localize("UTC")
-    return df
-
-def arrow_safe_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Ensure dataframes are friendly to Streamlit's Arrow serializer."""
-    if df.empty:
-        return df
-    frame = df.copy()
-    frame = frame.reset_index()
-    for c in frame.columns:
-        if pd.api.types.is_object_dtype(frame[c]) or pd.api.types.is_string_dtype(frame[c]):
-            try:
-                coerced = pd.to_datetime(frame[c], errors="coerce")
-                if coerced.notna().sum() >= max(1, int(0.8 * len(coerced))):
-                    frame[c] = coerced
-            except Exception:
-                pass
-        if pd.api.types.is_datetime64_any_dtype(frame[c]):
-            try:
-                if getattr(frame[c].dt, "tz", None) is not None:
-                    frame[c] = frame[c].dt.tz_localize(None)
-            except Exception:
-                frame[c] = frame[c].astype(str)
-    return frame
+# Config + helpers (shared HTTP session, cache, transforms) live in FirstDataMine/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "FirstDataMine"))
+from config import DEFAULT_LOCATIONS
+from weather_core import (
+    fetch_hourly_json, hourly_to_frame, to_local_naive,
+    daily_summary, rolling_anomaly, save_cache, load_cache, arrow_safe_df, frame_digest
+)
 
 # ---------------------------- UI ----------------------------
 st.set_page_config(page_title="Grand Junction Weather Mine", layout="wide")
@@ -165,8 +43,12 @@ show_debug = st.sidebar.checkbox("Show raw query URL", value=False)
 try:
     js = fetch_hourly_json(lat, lon, days)
     df_utc = hourly_to_frame(js)
-    # Save/replace cache each run (simple, reproducible)
-    save_cache(df_utc, lat, lon)
+    # Save/replace cache only when the data changed since the last write
+    digest = frame_digest(df_utc)
+    hash_key = f"cache_hash_{lat}_{lon}"
+    if st.session_state.get(hash_key) != digest:
+        save_cache(df_utc, lat, lon)
+        st.session_state[hash_key] = digest
 except Exception as e:
     st.error(f"Fetch error: {e}")
     df_utc = load_cache(lat, lon)